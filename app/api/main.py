@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 
 from app.orchestrator.pipeline import CourseSessionManager, CourseSessionPipeline
@@ -17,6 +20,8 @@ from app.schemas.api import (
     NotesRequest,
     OutlineRequest,
     ParseRequest,
+    QABatchRequest,
+    QABatchResponse,
     QARequest,
     SessionDetail,
     SessionListResponse,
@@ -38,7 +43,9 @@ from app.schemas.common import (
     ParseResponse,
     QAResponse,
 )
+from app.schemas.trusted import construct_trusted
 from app.storage import uploads
+from app.storage.database import notes_db, slides_db
 from app.storage.repository import repository
 from app.storage.settings_store import get_llm_settings, save_llm_settings
 from app.modules.exporter.export_service import ExportService
@@ -47,8 +54,17 @@ from app.modules.note.note_tasks import note_task_manager, submit_note_generatio
 from app.modules.note.llm_client import LLM_PROVIDER, reset_llm_cache
 from app.configs.settings import settings
 from app.utils.logger import logger
+from app.utils.orjson_response import ORJSONModelResponse
 
-app = FastAPI(title="StudyCompanion API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    slides_db.close_all()
+    notes_db.close_all()
+
+
+app = FastAPI(title="StudyCompanion API", version="1.0.0", lifespan=lifespan)
 manager = CourseSessionManager()
 
 
@@ -70,15 +86,18 @@ async def upload_file(
     if suffix not in ALLOWED_EXTENSIONS:
         logger.warning("文件类型不支持: %s", suffix)
         raise HTTPException(status_code=400, detail="仅支持 .pptx 与 .pdf 文件")
-    data = await file.read()
-    size_mb = len(data) / (1024 * 1024)
+    # The upload is already spooled; measure it in place instead of reading it into memory.
+    stream = file.file
+    stream.seek(0, os.SEEK_END)
+    size_mb = stream.tell() / (1024 * 1024)
+    stream.seek(0)
     if size_mb > settings.limits.max_file_mb:
         logger.warning("文件超出大小限制: %.2fMB > %dMB", size_mb, settings.limits.max_file_mb)
         raise HTTPException(
             status_code=400,
             detail=f"文件超过 {settings.limits.max_file_mb}MB 限制",
         )
-    file_id, _ = uploads.save_upload(filename, data)
+    file_id, _ = await run_in_threadpool(uploads.save_upload, filename, stream)
     session_id = manager.create_session(title or Path(filename).stem, file_id)
     logger.info("文件上传完成: session_id=%s file_id=%s", session_id, file_id)
     return {"file_id": file_id, "session_id": session_id}
@@ -213,15 +232,15 @@ async def stream_note_task(task_id: str):
     return StreamingResponse(event_generator(), media_type="text/event-stream", headers=headers)
 
 
-@app.post("/api/v1/cards/generate")
+@app.post("/api/v1/cards/generate", response_class=ORJSONModelResponse)
 def generate_cards(request: CardsRequest):
     pipeline = get_pipeline(request.session_id)
     logger.info("生成知识卡片: session_id=%s note_doc_id=%s", request.session_id, request.note_doc_id)
     cards_id, cards = pipeline.generate_cards(request.note_doc_id)
-    return {"cards_id": cards_id, "cards": cards}
+    return ORJSONModelResponse({"cards_id": cards_id, "cards": cards})
 
 
-@app.post("/api/v1/mock/generate")
+@app.post("/api/v1/mock/generate", response_class=ORJSONModelResponse)
 def generate_mock(request: MockRequest):
     pipeline = get_pipeline(request.session_id)
     logger.info(
@@ -238,15 +257,15 @@ def generate_mock(request: MockRequest):
         request.options.size,
         request.options.difficulty,
     )
-    return {"paper_id": paper_id, "paper": paper}
+    return ORJSONModelResponse({"paper_id": paper_id, "paper": paper})
 
 
-@app.post("/api/v1/mindmap/generate")
+@app.post("/api/v1/mindmap/generate", response_class=ORJSONModelResponse)
 def generate_mindmap(request: MindmapRequest):
     pipeline = get_pipeline(request.session_id)
     logger.info("生成思维导图: session_id=%s outline_id=%s", request.session_id, request.outline_tree_id)
     graph_id, graph = pipeline.generate_mindmap()
-    return {"graph_id": graph_id, "graph": graph}
+    return ORJSONModelResponse({"graph_id": graph_id, "graph": graph})
 
 
 @app.post("/api/v1/export", response_model=ExportResponse)
@@ -271,64 +290,85 @@ def export_artifact(request: ExportRequest):
 def ask_question(request: QARequest):
     qa_service = QAService(request.session_id)
     logger.info("问答请求: session_id=%s scope=%s question=%s", request.session_id, request.scope, request.question)
-    note_doc = _latest_note(request.session_id)
-    cards = _latest_cards(request.session_id)
-    mock = _latest_mock(request.session_id)
+    note_doc, cards, mock = _qa_sources(request.session_id, request.scope)
     return qa_service.ask(request.question, request.scope, note_doc, cards, mock)
 
 
+@app.post("/api/v1/qa/ask_batch", response_model=QABatchResponse)
+def ask_questions(request: QABatchRequest):
+    qa_service = QAService(request.session_id)
+    logger.info(
+        "批量问答请求: session_id=%s scope=%s count=%s",
+        request.session_id,
+        request.scope,
+        len(request.questions),
+    )
+    note_doc, cards, mock = _qa_sources(request.session_id, request.scope)
+    answers = qa_service.ask_batch(request.questions, request.scope, note_doc, cards, mock)
+    return QABatchResponse(answers=answers)
+
+
 def _load_note(note_doc_id: str) -> NoteDoc:
-    payload = repository.load_artifact(note_doc_id)
-    if not payload:
+    artifact = repository.load_artifact_typed(note_doc_id, NoteDoc)
+    if artifact is None:
         raise HTTPException(status_code=404, detail="note doc not found")
-    return NoteDoc(**payload)
+    return artifact
 
 
 def _load_cards(cards_id: str) -> KnowledgeCards:
-    payload = repository.load_artifact(cards_id)
-    if not payload:
+    artifact = repository.load_artifact_typed(cards_id, KnowledgeCards)
+    if artifact is None:
         raise HTTPException(status_code=404, detail="cards not found")
-    return KnowledgeCards(**payload)
+    return artifact
 
 
 def _load_mock(mock_id: str) -> MockPaper:
-    payload = repository.load_artifact(mock_id)
-    if not payload:
+    artifact = repository.load_artifact_typed(mock_id, MockPaper)
+    if artifact is None:
         raise HTTPException(status_code=404, detail="mock paper not found")
-    return MockPaper(**payload)
+    return artifact
 
 
 def _load_mindmap(graph_id: str) -> MindmapGraph:
-    payload = repository.load_artifact(graph_id)
-    if not payload:
+    artifact = repository.load_artifact_typed(graph_id, MindmapGraph)
+    if artifact is None:
         raise HTTPException(status_code=404, detail="mindmap not found")
-    return MindmapGraph(**payload)
+    return artifact
 
 
 def _latest_note(session_id: str) -> NoteDoc | None:
     artifacts = repository.list_artifacts(session_id, "note_doc")
     if not artifacts:
         return None
-    artifact = artifacts[-1]
-    return NoteDoc(**artifact[1])
+    return construct_trusted(NoteDoc, artifacts[-1][1])
 
 
 def _latest_cards(session_id: str) -> KnowledgeCards | None:
     artifacts = repository.list_artifacts(session_id, "cards")
     if not artifacts:
         return None
-    return KnowledgeCards(**artifacts[-1][1])
+    return construct_trusted(KnowledgeCards, artifacts[-1][1])
 
 
 def _latest_mock(session_id: str) -> MockPaper | None:
     artifacts = repository.list_artifacts(session_id, "mock")
     if not artifacts:
         return None
-    return MockPaper(**artifacts[-1][1])
+    return construct_trusted(MockPaper, artifacts[-1][1])
+
+
+def _qa_sources(
+    session_id: str, scope: str
+) -> tuple[NoteDoc | None, KnowledgeCards | None, MockPaper | None]:
+    # QA only reads the artifact of the requested scope; skip loading the other two.
+    note_doc = _latest_note(session_id) if scope == "notes" else None
+    cards = _latest_cards(session_id) if scope == "cards" else None
+    mock = _latest_mock(session_id) if scope == "mock" else None
+    return note_doc, cards, mock
 
 
 def _format_sse(payload: dict) -> str:
-    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    return f"data: {orjson.dumps(payload).decode()}\n\n"
 
 
 @app.get("/api/v1/notes/{note_doc_id}", response_model=NoteDoc)
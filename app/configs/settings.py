@@ -53,6 +53,13 @@ class LimitsConfig:
     max_file_mb: int = 100
 
 
+@dataclass(slots=True)
+class ParserConfig:
+    max_workers: int = 0
+    parallel_min_pages: int = 40
+    pdf_engine: str = "pdfium"
+
+
 @dataclass(slots=True)
 class NotesConfig:
     default_detail: str = "medium"
@@ -76,14 +83,27 @@ class RAGChunkConfig:
 class RAGConfig:
     chunk: RAGChunkConfig = field(default_factory=RAGChunkConfig)
     note_max_workers: int = 3
+    faiss_index_type: str = "flat"
+    faiss_nprobe: int = 8
+    faiss_omp_threads: int = 0
+    use_gpu_faiss: bool = False
+    embed_batch_size: int = 0
+    embed_max_workers: int = 4
+
+
+@dataclass(slots=True)
+class StorageConfig:
+    parallel_delete: bool = True
 
 
 @dataclass(slots=True)
 class Settings:
     limits: LimitsConfig = field(default_factory=LimitsConfig)
+    parser: ParserConfig = field(default_factory=ParserConfig)
     notes: NotesConfig = field(default_factory=NotesConfig)
     export: ExportConfig = field(default_factory=ExportConfig)
     rag: RAGConfig = field(default_factory=RAGConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
 
     @classmethod
     def load(cls, path: Optional[str] = None) -> "Settings":
@@ -96,6 +116,7 @@ class Settings:
         rag_data = merged.get("rag", {})
         return cls(
             limits=LimitsConfig(**merged.get("limits", {})),
+            parser=ParserConfig(**merged.get("parser", {})),
             notes=NotesConfig(**merged.get("notes", {})),
             export=ExportConfig(
                 pdf_header=merged.get("export", {}).get("pdf", {}).get("header", True),
@@ -105,7 +126,14 @@ class Settings:
             rag=RAGConfig(
                 chunk=RAGChunkConfig(**rag_data.get("chunk", {})),
                 note_max_workers=int(rag_data.get("note_max_workers", 3)),
+                faiss_index_type=str(rag_data.get("faiss_index_type", "flat")).lower(),
+                faiss_nprobe=int(rag_data.get("faiss_nprobe", 8)),
+                faiss_omp_threads=int(rag_data.get("faiss_omp_threads", 0)),
+                use_gpu_faiss=bool(rag_data.get("use_gpu_faiss", False)),
+                embed_batch_size=int(rag_data.get("embed_batch_size", 0)),
+                embed_max_workers=int(rag_data.get("embed_max_workers", 4)),
             ),
+            storage=StorageConfig(**merged.get("storage", {})),
         )
 
 
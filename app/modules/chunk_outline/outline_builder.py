@@ -19,9 +19,9 @@ class OutlineBuilder:
             )
             summary = take_sentences(full_text, 2)[:240] or "本页内容概述为空。"
             section_id = new_id("s")
-            anchors = [AnchorRef(page=page.page_no, ref=title_el.ref if title_el else e.ref) for e in content_elements[:1] or page.elements[:1]]
+            anchors = [AnchorRef.model_construct(page=page.page_no, ref=title_el.ref if title_el else e.ref) for e in content_elements[:1] or page.elements[:1]]
             children.append(
-                OutlineNode(
+                OutlineNode.model_construct(
                     section_id=section_id,
                     title=section_title,
                     summary=summary,
@@ -35,7 +35,7 @@ class OutlineBuilder:
             if children
             else "未检测到有效章节。"
         )
-        root = OutlineNode(
+        root = OutlineNode.model_construct(
             section_id=new_id("root"),
             title=title,
             summary=root_summary,
@@ -43,7 +43,7 @@ class OutlineBuilder:
             level=0,
             children=children,
         )
-        return OutlineTree(root=root)
+        return OutlineTree.model_construct(root=root)
 
     def _resolve_section_title(self, page, title_el, content_elements) -> str:
         if title_el and title_el.content:
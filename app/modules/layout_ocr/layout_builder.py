@@ -24,8 +24,8 @@ class LayoutBuilder:
                 element = self._block_to_element(slide.page_no, page_headline, block)
                 if element:
                     elements.append(element)
-            pages.append(LayoutPage(page_no=slide.page_no, elements=elements))
-        return LayoutDoc(pages=pages)
+            pages.append(LayoutPage.model_construct(page_no=slide.page_no, elements=elements))
+        return LayoutDoc.model_construct(pages=pages)
 
     def _block_to_element(
         self,
@@ -36,7 +36,7 @@ class LayoutBuilder:
         if block.type in {BlockType.title, BlockType.text}:
             content = normalize_whitespace(block.raw_text or "")
             kind = BlockType.title if block.type == BlockType.title else BlockType.text
-            return LayoutElement(ref=block.id, kind=kind, content=content)
+            return LayoutElement.model_construct(ref=block.id, kind=kind, content=content)
         if block.type == BlockType.formula:
             caption = self._semantic_caption(
                 block.raw_text,
@@ -44,7 +44,7 @@ class LayoutBuilder:
                 page_no,
                 fallback="关键公式",
             )
-            return LayoutElement(
+            return LayoutElement.model_construct(
                 ref=block.id,
                 kind=BlockType.formula,
                 latex=block.raw_text,
@@ -57,7 +57,7 @@ class LayoutBuilder:
                 page_no,
                 fallback="插图",
             )
-            return LayoutElement(
+            return LayoutElement.model_construct(
                 ref=block.id,
                 kind=BlockType.image,
                 image_uri=block.asset_uri,
@@ -70,7 +70,7 @@ class LayoutBuilder:
                 page_no,
                 fallback="数据表",
             )
-            return LayoutElement(
+            return LayoutElement.model_construct(
                 ref=block.id,
                 kind=BlockType.table,
                 content=block.raw_text,
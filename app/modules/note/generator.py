@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import threading
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_text_splitters import TokenTextSplitter
@@ -20,29 +22,87 @@ from app.schemas.common import (
     OutlineNode,
     OutlineTree,
 )
-from app.storage.vector_store import load_or_create, save
+from app.storage.vector_store import load_or_create
 from app.utils.identifiers import new_id
 from app.utils.logger import logger
 
 
+_SYSTEM_PROMPT_PREFIX = (
+    "You are StudyCompanion, tasked with generating structured course notes. "
+    "You must adhere to the provided outline, respect the style instructions, "
+    "and reference the supplied context. Output in GitHub-flavoured Markdown. "
+)
+_SYSTEM_PROMPTS = {
+    "zh": _SYSTEM_PROMPT_PREFIX + "Write every heading, sentence, and annotation in Simplified Chinese.",
+    "en": _SYSTEM_PROMPT_PREFIX + "Write every heading, sentence, and annotation in English.",
+}
+
+
+# Format and content rules shared by every section prompt.
+_SECTION_PROMPT_REQUIREMENTS = (
+    "请基于以上信息，生成**严格符合以下格式和内容要求**的 Markdown 内容：\n"
+    "### 格式要求\n"
+    "1. **标题层级**：仅使用二级标题（##）和三级标题（###），禁止一级标题（#）。\n"
+    "   - 二级标题用于核心模块（如“## 核心概念”“## 推导过程”）。\n"
+    "   - 三级标题用于子模块（如“### 定义1”“### 性质2”）。\n"
+    "2. **列表格式**：所有列表必须以短横线（-）开头，禁止星号（*）或数字序号。\n"
+    "3. **公式格式**：所有数学公式必须用 $$ 包裹（块级公式），如：$$L = -\\sum p_j \\log(q_j)$$。\n"
+    "   - 强制要求：公式必须完整闭合（开头和结尾都是 $$），禁止单独出现 $ 或未闭合的 $$。\n"
+    "   - 禁止公式内换行，确保 $$ 之间为完整公式（避免拆分到两行）。\n"
+    "4. **段落分隔**：不同模块之间用**一个空行**分隔，禁止连续空行。\n"
+    "### 内容要求\n"
+    "1. **严格过滤无关信息**：\n"
+    "   - 剔除所有页码标记（如 `6/78` `10/78` 等格式）。\n"
+    "   - 剔除重复文本、无意义标记（如 `Output not zero-centered`）。\n"
+    "   - 禁止直接复制上下文的原始段落，需用自己的语言重新组织。\n"
+    "2. **必含结构**：\n"
+    "   - ## 核心概念与解释\n"
+    "   - ## 关键结论或定理\n"
+    "   - ## 示例与推导（若上下文支持则包含）\n"
+    "   - ## 小结\n"
+    "3. **避免添加**：超出上下文的内容（如需补充请标注“扩展说明”）、冗余格式标记。\n"
+    "请严格遵循以上要求，输出仅保留与章节主题强相关的核心信息，格式统一、内容精炼。"
+)
+
+
+# Building a TokenTextSplitter loads the tiktoken encoding; reuse one per chunk configuration.
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> TokenTextSplitter:
+    return TokenTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def _element_segments(elements: List[LayoutElement]) -> Iterator[str]:
+    for element in elements:
+        if element.content:
+            yield element.content
+        if element.caption:
+            yield f"{element.kind.value.title()}说明: {element.caption}"
+        if element.latex:
+            yield f"公式: {element.latex}"
+
+
 class NoteGenerator:
     def __init__(self, chunk_size: int = 500, chunk_overlap: int = 50, max_workers: int = 3):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.max_workers = max(1, max_workers)
+        # One pool per generator instance, shared by every session it serves.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="note-section"
+                    )
+        return self._executor
 
     def _build_documents(self, layout_doc: LayoutDoc) -> List[Document]:
         documents: List[Document] = []
         for page in layout_doc.pages:
-            content_segments = []
-            for element in page.elements:
-                if element.content:
-                    content_segments.append(element.content)
-                if element.caption:
-                    content_segments.append(f"{element.kind.value.title()}说明: {element.caption}")
-                if element.latex:
-                    content_segments.append(f"公式: {element.latex}")
-            joined = "\n".join(content_segments).strip()
+            joined = "\n".join(_element_segments(page.elements)).strip()
             if not joined:
                 continue
             documents.append(
@@ -53,14 +113,7 @@ class NoteGenerator:
             )
         if not documents:
             documents.append(Document(page_content="暂无内容。", metadata={"page_no": 0}))
-        splitter = TokenTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-        )
-        chunks: List[Document] = []
-        for doc in documents:
-            chunks.extend(splitter.split_documents([doc]))
-        return chunks
+        return _get_splitter(self.chunk_size, self.chunk_overlap).split_documents(documents)
 
     def generate(
         self,
@@ -75,19 +128,12 @@ class NoteGenerator:
         style_instructions = build_style_instructions(detail_level, difficulty, language)
         docs = self._build_documents(layout_doc)
         vector_store = load_or_create(session_id, docs)
-        language_label = "Simplified Chinese" if language == "zh" else "English"
-        system_prompt = (
-            "You are StudyCompanion, tasked with generating structured course notes. "
-            "You must adhere to the provided outline, respect the style instructions, "
-            "and reference the supplied context. Output in GitHub-flavoured Markdown. "
-            f"Write every heading, sentence, and annotation in {language_label}."
-        )
+        system_prompt = _SYSTEM_PROMPTS["zh" if language == "zh" else "en"]
         total_sections = len(outline.root.children)
         if progress_callback:
             progress_callback({"phase": "sections_total", "total": total_sections})
         figures_by_page, equations_by_page = self._collect_assets(layout_doc)
         if total_sections == 0:
-            save(session_id, vector_store)
             return NoteDoc(
                 style={"detail_level": detail_level, "difficulty": difficulty, "language": language},
                 toc=[],
@@ -151,14 +197,13 @@ class NoteGenerator:
                 index, note_section = render_section(job)
                 sections_map[index] = note_section
         else:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = [executor.submit(render_section, job) for job in section_jobs]
-                for future in as_completed(futures):
-                    index, note_section = future.result()
-                    sections_map[index] = note_section
+            executor = self._get_executor()
+            futures = [executor.submit(render_section, job) for job in section_jobs]
+            for future in as_completed(futures):
+                index, note_section = future.result()
+                sections_map[index] = note_section
 
         sections = [sections_map[index] for index in sorted(sections_map)]
-        save(session_id, vector_store)
         toc = [{"section_id": section.section_id, "title": section.title} for section in outline.root.children]
         return NoteDoc(
             style={"detail_level": detail_level, "difficulty": difficulty, "language": language},
@@ -193,29 +238,7 @@ class NoteGenerator:
             f"章节标题: {section.title}\n"
             f"大纲摘要: {section.summary}\n"
             f"风格指令:\n{style_instructions}\n\n"
-            f"上下文材料:\n{context_text}\n\n"
-            "请基于以上信息，生成**严格符合以下格式和内容要求**的 Markdown 内容：\n"
-            "### 格式要求\n"
-            "1. **标题层级**：仅使用二级标题（##）和三级标题（###），禁止一级标题（#）。\n"
-            "   - 二级标题用于核心模块（如“## 核心概念”“## 推导过程”）。\n"
-            "   - 三级标题用于子模块（如“### 定义1”“### 性质2”）。\n"
-            "2. **列表格式**：所有列表必须以短横线（-）开头，禁止星号（*）或数字序号。\n"
-            "3. **公式格式**：所有数学公式必须用 $$ 包裹（块级公式），如：$$L = -\sum p_j \log(q_j)$$。\n"
-        "   - 强制要求：公式必须完整闭合（开头和结尾都是 $$），禁止单独出现 $ 或未闭合的 $$。\n"
-        "   - 禁止公式内换行，确保 $$ 之间为完整公式（避免拆分到两行）。\n"
-            "4. **段落分隔**：不同模块之间用**一个空行**分隔，禁止连续空行。\n"
-            "### 内容要求\n"
-            "1. **严格过滤无关信息**：\n"
-            "   - 剔除所有页码标记（如 `6/78` `10/78` 等格式）。\n"
-            "   - 剔除重复文本、无意义标记（如 `Output not zero-centered`）。\n"
-            "   - 禁止直接复制上下文的原始段落，需用自己的语言重新组织。\n"
-            "2. **必含结构**：\n"
-            "   - ## 核心概念与解释\n"
-            "   - ## 关键结论或定理\n"
-            "   - ## 示例与推导（若上下文支持则包含）\n"
-            "   - ## 小结\n"
-            "3. **避免添加**：超出上下文的内容（如需补充请标注“扩展说明”）、冗余格式标记。\n"
-            "请严格遵循以上要求，输出仅保留与章节主题强相关的核心信息，格式统一、内容精炼。"
+            f"上下文材料:\n{context_text}\n\n" + _SECTION_PROMPT_REQUIREMENTS
         )
 
     def _fallback_section(self, section: OutlineNode, context_text: str) -> str:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from functools import lru_cache
 from typing import Any, Optional, Tuple
 
@@ -17,20 +18,33 @@ if os.getenv("OPENAI_API_KEY") and not os.getenv("GOOGLE_API_KEY"):
 
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", _default_provider).strip().lower()
 
-try:
-    from langchain_google_genai import (
-        ChatGoogleGenerativeAI,
-        GoogleGenerativeAIEmbeddings,
-    )
-except ImportError:
-    ChatGoogleGenerativeAI = None  # type: ignore
-    GoogleGenerativeAIEmbeddings = None  # type: ignore
 
-try:
-    from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-except ImportError:
-    ChatOpenAI = None  # type: ignore
-    OpenAIEmbeddings = None  # type: ignore
+# Provider SDKs are imported on first use so only the configured one pays its import cost.
+@lru_cache(maxsize=None)
+def _load_openai():
+    try:
+        from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+    except ImportError as exc:
+        raise ImportError(
+            "langchain-openai is required when LLM_PROVIDER='openai'. "
+            "Install it with `pip install langchain-openai openai`."
+        ) from exc
+    return ChatOpenAI, OpenAIEmbeddings
+
+
+@lru_cache(maxsize=None)
+def _load_google():
+    try:
+        from langchain_google_genai import (
+            ChatGoogleGenerativeAI,
+            GoogleGenerativeAIEmbeddings,
+        )
+    except ImportError as exc:
+        raise ImportError(
+            "langchain-google-genai is required when LLM_PROVIDER='google'. "
+            "Install it with `pip install langchain-google-genai google-generativeai`."
+        ) from exc
+    return ChatGoogleGenerativeAI, GoogleGenerativeAIEmbeddings
 
 
 def _require_env(value: str | None, var_name: str, provider: str) -> str:
@@ -89,77 +103,118 @@ def _resolve_models(
     return llm_model, embedding_model
 
 
-@lru_cache(maxsize=4)
+_embedding_cache: dict[Tuple[str, str, Optional[str], str], Any] = {}
+_embedding_lock = threading.Lock()
+
+
 def _embedding_model_factory(
     provider: str, embedding_model_name: str, base_url: Optional[str], api_key: str
 ):
-    if provider == "openai":
-        if OpenAIEmbeddings is None:
-            raise ImportError(
-                "langchain-openai is required when LLM_PROVIDER='openai'. "
-                "Install it with `pip install langchain-openai openai`."
-            )
-        kwargs = {"model": embedding_model_name, "openai_api_key": api_key}
-        if base_url:
-            kwargs["openai_api_base"] = base_url
-        return OpenAIEmbeddings(**kwargs)
-
-    if GoogleGenerativeAIEmbeddings is None:
-        raise ImportError(
-            "langchain-google-genai is required when LLM_PROVIDER='google'. "
-            "Install it with `pip install langchain-google-genai google-generativeai`."
-        )
+    key = (provider, embedding_model_name, base_url, api_key)
+    try:
+        return _embedding_cache[key]
+    except KeyError:
+        pass
+    with _embedding_lock:
+        model = _embedding_cache.get(key)
+        if model is None:
+            model = _create_embedding_model(provider, embedding_model_name, base_url, api_key)
+            _embedding_cache[key] = model
+    return model
+
+
+def _create_embedding_model(
+    provider: str, embedding_model_name: str, base_url: Optional[str], api_key: str
+):
+    builder = _EMBEDDING_BUILDERS.get(provider, _google_embeddings)
+    return builder(embedding_model_name, base_url, api_key)
+
+
+def _openai_embeddings(embedding_model_name: str, base_url: Optional[str], api_key: str):
+    _, OpenAIEmbeddings = _load_openai()
+    kwargs = {"model": embedding_model_name, "openai_api_key": api_key}
+    if base_url:
+        kwargs["openai_api_base"] = base_url
+    return OpenAIEmbeddings(**kwargs)
+
+
+def _google_embeddings(embedding_model_name: str, base_url: Optional[str], api_key: str):
+    _, GoogleGenerativeAIEmbeddings = _load_google()
     return GoogleGenerativeAIEmbeddings(model=embedding_model_name, google_api_key=api_key)
 
 
+_EMBEDDING_BUILDERS = {"openai": _openai_embeddings, "google": _google_embeddings}
+
+
+def _openai_credentials(overrides: dict[str, Any]) -> Tuple[str, Optional[str]]:
+    api_key = _resolve_openai_api_key(overrides)
+    base_url = _resolve_openai_base_url(overrides)
+    _set_env_if_needed("OPENAI_API_KEY", api_key)
+    if base_url:
+        _set_env_if_needed("OPENAI_API_BASE", base_url)
+    return api_key, base_url
+
+
+def _google_credentials(overrides: dict[str, Any]) -> Tuple[str, Optional[str]]:
+    api_key = _resolve_google_api_key(overrides)
+    _set_env_if_needed("GOOGLE_API_KEY", api_key)
+    return api_key, None
+
+
+# The provider can change at runtime through the settings API, so it is resolved per call
+# and dispatched through these tables rather than fixed at import.
+_CREDENTIAL_RESOLVERS = {"openai": _openai_credentials, "google": _google_credentials}
+
+
 def get_embedding_model():
     overrides = get_llm_settings()
     provider = _resolve_provider(overrides)
-    llm_model, embedding_model = _resolve_models(overrides, provider)
-    if provider == "openai":
-        api_key = _resolve_openai_api_key(overrides)
-        base_url = _resolve_openai_base_url(overrides)
-        _set_env_if_needed("OPENAI_API_KEY", api_key)
-        if base_url:
-            _set_env_if_needed("OPENAI_API_BASE", base_url)
-    else:
-        api_key = _resolve_google_api_key(overrides)
-        _set_env_if_needed("GOOGLE_API_KEY", api_key)
-        base_url = None
+    _, embedding_model = _resolve_models(overrides, provider)
+    api_key, base_url = _CREDENTIAL_RESOLVERS.get(provider, _google_credentials)(overrides)
     return _embedding_model_factory(provider, embedding_model, base_url, api_key)
 
 
-def get_llm(temperature: float = 0.3):
-    overrides = get_llm_settings()
-    provider = _resolve_provider(overrides)
-    llm_model, _ = _resolve_models(overrides, provider)
-    if provider == "openai":
-        if ChatOpenAI is None:
-            raise ImportError(
-                "langchain-openai is required when LLM_PROVIDER='openai'. "
-                "Install it with `pip install langchain-openai openai`."
-            )
-        api_key = _resolve_openai_api_key(overrides)
-        base_url = _resolve_openai_base_url(overrides)
-        _set_env_if_needed("OPENAI_API_KEY", api_key)
-        if base_url:
-            _set_env_if_needed("OPENAI_API_BASE", base_url)
-        kwargs = {
-            "model": llm_model,
-            "temperature": temperature,
-            "openai_api_key": api_key,
-        }
-        if base_url:
-            kwargs["openai_api_base"] = base_url
-        return ChatOpenAI(**kwargs)
-
-    if ChatGoogleGenerativeAI is None:
-        raise ImportError(
-            "langchain-google-genai is required when LLM_PROVIDER='google'. "
-            "Install it with `pip install langchain-google-genai google-generativeai`."
-        )
-    api_key = _resolve_google_api_key(overrides)
-    _set_env_if_needed("GOOGLE_API_KEY", api_key)
+_llm_cache: dict[Tuple[str, str, Optional[str], str, float], Any] = {}
+_llm_lock = threading.Lock()
+
+
+def _llm_factory(
+    provider: str, llm_model: str, base_url: Optional[str], api_key: str, temperature: float
+):
+    key = (provider, llm_model, base_url, api_key, temperature)
+    try:
+        return _llm_cache[key]
+    except KeyError:
+        pass
+    with _llm_lock:
+        llm = _llm_cache.get(key)
+        if llm is None:
+            llm = _create_llm(provider, llm_model, base_url, api_key, temperature)
+            _llm_cache[key] = llm
+    return llm
+
+
+def _create_llm(
+    provider: str, llm_model: str, base_url: Optional[str], api_key: str, temperature: float
+):
+    builder = _LLM_BUILDERS.get(provider, _google_llm)
+    return builder(llm_model, base_url, api_key, temperature)
+
+
+def _openai_llm(llm_model: str, base_url: Optional[str], api_key: str, temperature: float):
+    ChatOpenAI, _ = _load_openai()
+    kwargs = {
+        "model": llm_model,
+        "temperature": temperature,
+        "openai_api_key": api_key,
+    }
+    if base_url:
+        kwargs["openai_api_base"] = base_url
+    return ChatOpenAI(**kwargs)
+
+
+def _google_llm(llm_model: str, base_url: Optional[str], api_key: str, temperature: float):
+    ChatGoogleGenerativeAI, _ = _load_google()
     return ChatGoogleGenerativeAI(
         model=llm_model,
         convert_system_message_to_human=True,
@@ -168,5 +223,19 @@ def get_llm(temperature: float = 0.3):
     )
 
 
+_LLM_BUILDERS = {"openai": _openai_llm, "google": _google_llm}
+
+
+def get_llm(temperature: float = 0.3):
+    overrides = get_llm_settings()
+    provider = _resolve_provider(overrides)
+    llm_model, _ = _resolve_models(overrides, provider)
+    api_key, base_url = _CREDENTIAL_RESOLVERS.get(provider, _google_credentials)(overrides)
+    return _llm_factory(provider, llm_model, base_url, api_key, temperature)
+
+
 def reset_llm_cache() -> None:
-    _embedding_model_factory.cache_clear()
+    with _embedding_lock:
+        _embedding_cache.clear()
+    with _llm_lock:
+        _llm_cache.clear()
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import threading
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from queue import Queue
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
+
+import orjson
 
 from app.orchestrator.pipeline import CourseSessionPipeline
 from app.schemas.common import NoteDoc
@@ -12,6 +14,25 @@ from app.utils.identifiers import new_id
 from app.utils.logger import logger
 
 
+PAYLOAD_FIELDS = frozenset(
+    {
+        "task_id",
+        "session_id",
+        "status",
+        "progress",
+        "detail_level",
+        "difficulty",
+        "language",
+        "total_sections",
+        "current_section",
+        "message",
+        "note_doc_id",
+        "error",
+    }
+)
+OPTIONAL_PAYLOAD_FIELDS = frozenset({"note_doc_id", "error"})
+
+
 @dataclass
 class NoteTaskState:
     task_id: str
@@ -28,11 +49,29 @@ class NoteTaskState:
     note_doc: Optional[NoteDoc] = None
     error: Optional[str] = None
     events: "Queue[dict]" = field(default_factory=Queue)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    payload: dict = field(default_factory=dict, repr=False, compare=False)
+    dirty: Set[str] = field(default_factory=lambda: set(PAYLOAD_FIELDS), repr=False, compare=False)
+    note_doc_json: Optional[bytes] = field(default=None, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        # Record which payload keys changed so `_serialize` only patches those.
+        if name in PAYLOAD_FIELDS and "dirty" in self.__dict__:
+            self.dirty.add(name)
+        elif name == "note_doc":
+            object.__setattr__(self, "note_doc_json", None)
+
+
+ACTIVE_STATUSES = frozenset({"queued", "running"})
 
 
 class NoteTaskManager:
     def __init__(self) -> None:
         self._tasks: Dict[str, NoteTaskState] = {}
+        self._active_sessions: Dict[str, int] = {}
+        # Only guards task registration and the active-session counters; reads are
+        # lock-free dict lookups and per-task fields are protected by `state.lock`.
         self._lock = threading.Lock()
 
     def create_task(
@@ -49,25 +88,27 @@ class NoteTaskManager:
         )
         with self._lock:
             self._tasks[task_id] = state
-        self._push_event(state, include_result=False)
+            self._active_sessions[session_id] = self._active_sessions.get(session_id, 0) + 1
+        with state.lock:
+            self._push_event(state, include_result=False)
         return state
 
     def mark_running(self, task_id: str) -> None:
-        with self._lock:
-            state = self._tasks.get(task_id)
-            if not state:
-                return
+        state = self._tasks.get(task_id)
+        if not state:
+            return
+        with state.lock:
             state.status = "running"
             state.message = "笔记生成已开始…"
-        self._push_event(state, include_result=False)
+            self._push_event(state, include_result=False)
 
     def handle_progress(self, task_id: str, event: dict) -> None:
         if not isinstance(event, dict):
             return
-        with self._lock:
-            state = self._tasks.get(task_id)
-            if not state:
-                return
+        state = self._tasks.get(task_id)
+        if not state:
+            return
+        with state.lock:
             state.status = "running"
             phase = event.get("phase")
             status = event.get("status")
@@ -101,31 +142,39 @@ class NoteTaskManager:
                 if isinstance(message, str):
                     state.message = message
             state.progress = min(state.progress, 100.0)
-        self._push_event(state, include_result=False)
+            self._push_event(state, include_result=False)
 
     def mark_completed(self, task_id: str, note_doc_id: str, note_doc: NoteDoc) -> None:
-        with self._lock:
-            state = self._tasks.get(task_id)
-            if not state:
-                return
+        state = self._tasks.get(task_id)
+        if not state:
+            return
+        note_doc_json = note_doc.model_dump_json().encode()
+        with state.lock:
+            was_active = state.status in ACTIVE_STATUSES
             state.status = "completed"
             state.progress = 100.0
             state.current_section = None
             state.message = "笔记生成完成"
             state.note_doc_id = note_doc_id
             state.note_doc = note_doc
-        self._push_event(state, include_result=True)
+            state.note_doc_json = note_doc_json
+            self._push_event(state, include_result=True)
+        if was_active:
+            self._release_session(state.session_id)
 
     def mark_failed(self, task_id: str, error: str) -> None:
-        with self._lock:
-            state = self._tasks.get(task_id)
-            if not state:
-                return
+        state = self._tasks.get(task_id)
+        if not state:
+            return
+        with state.lock:
+            was_active = state.status in ACTIVE_STATUSES
             state.status = "failed"
             state.current_section = None
             state.message = "笔记生成失败"
             state.error = error
-        self._push_event(state, include_result=True)
+            self._push_event(state, include_result=True)
+        if was_active:
+            self._release_session(state.session_id)
 
     def snapshot(
         self,
@@ -133,25 +182,28 @@ class NoteTaskManager:
         include_result: bool = True,
         for_json: bool = False,
     ) -> Optional[dict]:
-        with self._lock:
-            state = self._tasks.get(task_id)
-            if not state:
-                return None
+        state = self._tasks.get(task_id)
+        if not state:
+            return None
+        with state.lock:
             return self._serialize(state, include_result=include_result, for_json=for_json)
 
     def event_queue(self, task_id: str) -> Optional["Queue[dict]"]:
-        with self._lock:
-            state = self._tasks.get(task_id)
-            if not state:
-                return None
-            return state.events
+        state = self._tasks.get(task_id)
+        if not state:
+            return None
+        return state.events
 
     def has_active_task(self, session_id: str) -> bool:
+        return self._active_sessions.get(session_id, 0) > 0
+
+    def _release_session(self, session_id: str) -> None:
         with self._lock:
-            return any(
-                state.session_id == session_id and state.status in {"queued", "running"}
-                for state in self._tasks.values()
-            )
+            remaining = self._active_sessions.get(session_id, 0) - 1
+            if remaining > 0:
+                self._active_sessions[session_id] = remaining
+            else:
+                self._active_sessions.pop(session_id, None)
 
     def _push_event(self, state: NoteTaskState, include_result: bool) -> None:
         payload = self._serialize(state, include_result=include_result, for_json=True)
@@ -163,33 +215,39 @@ class NoteTaskManager:
         include_result: bool,
         for_json: bool,
     ) -> dict:
-        data: dict = {
-            "task_id": state.task_id,
-            "session_id": state.session_id,
-            "status": state.status,
-            "progress": round(state.progress, 2),
-            "detail_level": state.detail_level,
-            "difficulty": state.difficulty,
-            "language": state.language,
-            "total_sections": state.total_sections,
-            "current_section": state.current_section,
-            "message": state.message,
-        }
-        if state.note_doc_id:
-            data["note_doc_id"] = state.note_doc_id
-        if state.error:
-            data["error"] = state.error
+        payload = state.payload
+        for key in state.dirty:
+            value = getattr(state, key)
+            if key == "progress":
+                value = round(value, 2)
+            elif key in OPTIONAL_PAYLOAD_FIELDS and not value:
+                payload.pop(key, None)
+                continue
+            payload[key] = value
+        state.dirty.clear()
+        data = dict(payload)
         if include_result and state.note_doc is not None:
-            data["note_doc"] = (
-                state.note_doc.model_dump()
-                if for_json
-                else state.note_doc
-            )
+            if for_json:
+                # The note doc is immutable once the task completes: serialize it once and
+                # splice the bytes in as an orjson fragment, so JSON payloads must be
+                # encoded with orjson.
+                if state.note_doc_json is None:
+                    state.note_doc_json = state.note_doc.model_dump_json().encode()
+                data["note_doc"] = orjson.Fragment(state.note_doc_json)
+            else:
+                data["note_doc"] = state.note_doc
         return data
 
 
 note_task_manager = NoteTaskManager()
-_executor = ThreadPoolExecutor(max_workers=2)
+
+MAX_CONCURRENT_TASKS = 2
+
+# Tasks are scheduled as coroutines on a dedicated event loop so queued jobs wait on
+# the semaphore instead of occupying worker threads; only running jobs hold a thread.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="note-tasks", daemon=True).start()
+_task_slots = asyncio.Semaphore(MAX_CONCURRENT_TASKS)
 
 
 def submit_note_generation_task(
@@ -217,5 +275,9 @@ def submit_note_generation_task(
             )
             note_task_manager.mark_failed(state.task_id, str(exc))
 
-    _executor.submit(runner)
+    async def schedule() -> None:
+        async with _task_slots:
+            await asyncio.to_thread(runner)
+
+    asyncio.run_coroutine_threadsafe(schedule(), _loop)
     return state.task_id
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 
 
 @dataclass(frozen=True)
@@ -99,6 +100,9 @@ DIFFICULTY_POLICIES = {
     ),
 }
 
+_DETAIL_GET = DETAIL_POLICIES.__getitem__
+_DIFFICULTY_GET = DIFFICULTY_POLICIES.__getitem__
+
 
 BLUEPRINT_TRANSLATIONS = {
     "## 核心要点：2-3 条精炼 bullet，总结本节最重要的事实或结论。": "## Key Takeaways: Provide 2-3 concise bullets summarizing the most important facts or conclusions.",
@@ -118,15 +122,64 @@ BLUEPRINT_TRANSLATIONS = {
 }
 
 
+_LANG_INSTRUCTION_ZH = (
+    "Use Simplified Chinese for every heading, paragraph, and bullet; "
+    "translate technical terms into Chinese when possible."
+)
+_LANG_INSTRUCTION_EN = (
+    "Write all headings, sentences, and annotations in fluent English; "
+    "translate any Chinese context instead of copying it."
+)
+_FILL_INSTRUCTION = "Only fill a section when the retrieved context covers it; otherwise write “待补充”。"
+_ANCHOR_INSTRUCTION = "Use anchors from the outline when referencing sources; format as `参考锚点：anchor:...`."
+_MISSING_EVIDENCE_INSTRUCTION = "When contextual evidence is missing, state “待补充” instead of fabricating details."
+_SKELETON_PREFIX = "Follow the Markdown section skeleton below:\n  "
+
+_INSTRUCTION_TEMPLATES: tuple[str, ...] = (
+    "Target total length between {length_ratio[0]:.1f}x and {length_ratio[1]:.1f}x of the base outline.",
+    _SKELETON_PREFIX + "{structure_lines}",
+    _FILL_INSTRUCTION,
+    "{paragraph_bias}",
+    "{figure_caption_style}",
+    "{summary_policy}",
+    "{example_policy}",
+    "{tone}",
+    "{terminology_density}",
+    "{sentence_length}",
+    "{formula_usage}",
+    "{variable_policy}",
+    "{constraints}",
+    _ANCHOR_INSTRUCTION,
+    _MISSING_EVIDENCE_INSTRUCTION,
+    "{language_instruction}",
+)
+
+
 def _localize_blueprint(entries: tuple[str, ...], language: str) -> tuple[str, ...]:
     if language != "en":
         return entries
     return tuple(BLUEPRINT_TRANSLATIONS.get(item, item) for item in entries)
 
 
+_BLUEPRINT_STRUCTURE_LINES: dict[tuple[str, str], str] = {
+    (detail_level, language): "\n  ".join(
+        f"{index}. {item}"
+        for index, item in enumerate(_localize_blueprint(policy.section_blueprint, language), start=1)
+    )
+    for detail_level, policy in DETAIL_POLICIES.items()
+    for language in ("zh", "en")
+}
+
+
+def _structure_lines(detail_level: str, language: str) -> str:
+    key = (detail_level, "en" if language == "en" else "zh")
+    return _BLUEPRINT_STRUCTURE_LINES[key]
+
+
+@lru_cache(maxsize=32)
 def build_style_instructions(detail_level: str, difficulty: str, language: str = "zh") -> str:
-    detail = DETAIL_POLICIES[detail_level]
-    difficulty_policy = DIFFICULTY_POLICIES[difficulty]
+    detail = _DETAIL_GET(detail_level)
+    difficulty_policy = _DIFFICULTY_GET(difficulty)
     summary_policy = (
         f"Provide section summaries of {detail.summary_length[0]}-{detail.summary_length[1]} sentences."
         if detail.requires_summary
@@ -137,31 +190,12 @@ def build_style_instructions(detail_level: str, difficulty: str, language: str =
         if detail.examples_per_section
         else "Skip detailed examples; focus on conclusions and key definitions."
     )
-    blueprint = _localize_blueprint(detail.section_blueprint, language)
-    structure_lines = "\n  ".join(
-        f"{index + 1}. {item}" for index, item in enumerate(blueprint)
-    )
-    language_instruction = (
-        "Use Simplified Chinese for every heading, paragraph, and bullet; translate technical terms into Chinese when possible."
-        if language == "zh"
-        else "Write all headings, sentences, and annotations in fluent English; translate any Chinese context instead of copying it."
-    )
-    instructions = [
-        f"Target total length between {detail.length_ratio[0]:.1f}x and {detail.length_ratio[1]:.1f}x of the base outline.",
-        "Follow the Markdown section skeleton below:\n  " + structure_lines,
-        "Only fill a section when the retrieved context covers it; otherwise write “待补充”。",
-        detail.paragraph_bias,
-        detail.figure_caption_style,
-        summary_policy,
-        example_policy,
-        difficulty_policy.tone,
-        difficulty_policy.terminology_density,
-        difficulty_policy.sentence_length,
-        difficulty_policy.formula_usage,
-        difficulty_policy.variable_policy,
-        difficulty_policy.constraints,
-        "Use anchors from the outline when referencing sources; format as `参考锚点：anchor:...`.",
-        "When contextual evidence is missing, state “待补充” instead of fabricating details.",
-        language_instruction,
-    ]
-    return "\n".join(f"- {line}" for line in instructions)
+    ctx = {
+        **asdict(detail),
+        **asdict(difficulty_policy),
+        "summary_policy": summary_policy,
+        "example_policy": example_policy,
+        "structure_lines": _structure_lines(detail_level, language),
+        "language_instruction": _LANG_INSTRUCTION_ZH if language == "zh" else _LANG_INSTRUCTION_EN,
+    }
+    return "- " + "\n- ".join(template.format_map(ctx) for template in _INSTRUCTION_TEMPLATES)
@@ -1,18 +1,60 @@
 from __future__ import annotations
 
-from typing import List
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 
+from langchain_core.documents import Document
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_community.vectorstores import FAISS
 
 from app.modules.note.llm_client import get_embedding_model, get_llm
 from app.schemas.common import KnowledgeCards, MockPaper, NoteDoc, QAResponse
+from app.storage.vector_store import batch_similarity_search, build_store
+from app.utils.logger import logger
+
+SYSTEM_PROMPT = (
+    "You are an assistant answering questions strictly based on provided study materials. "
+    "Cite relevant sections when possible."
+)
+EMPTY_SCOPE_ANSWER = "当前范围内暂无内容可供检索。"
+ANSWER_LABEL_PATTERN = re.compile(r"^\s*\**A(\d+)\**\s*[:：]", re.MULTILINE)
+
+
+def _split_answers(text: str, expected: int) -> Dict[int, str]:
+    matches = list(ANSWER_LABEL_PATTERN.finditer(text))
+    answers: Dict[int, str] = {}
+    for position, match in enumerate(matches):
+        index = int(match.group(1))
+        if not 1 <= index <= expected or index in answers:
+            continue
+        end = matches[position + 1].start() if position + 1 < len(matches) else len(text)
+        answers[index] = text[match.end() : end].strip()
+    return answers
 
 
 class QAService:
+    # Embedded stores keyed by (session_id, scope, corpus digest); LRU bounded.
+    _store_cache: "OrderedDict[Tuple[str, str, str], Tuple[Any, FAISS]]" = OrderedDict()
+    _store_cache_lock = threading.Lock()
+    _store_cache_size = 32
+
     def __init__(self, session_id: str):
         self.session_id = session_id
 
+    @classmethod
+    def invalidate(cls, session_id: str, scope: str | None = None) -> None:
+        with cls._store_cache_lock:
+            stale = [
+                key
+                for key in cls._store_cache
+                if key[0] == session_id and (scope is None or key[1] == scope)
+            ]
+            for key in stale:
+                del cls._store_cache[key]
+
     def ask(
         self,
         question: str,
@@ -23,22 +65,84 @@ class QAService:
     ) -> QAResponse:
         texts, refs = self._collect_texts(scope, note_doc, cards, mock)
         if not texts:
-            return QAResponse(answer="当前范围内暂无内容可供检索。", refs=[])
-        store = FAISS.from_texts(texts, get_embedding_model())
-        docs = store.similarity_search(question, k=3)
-        context = "\n\n".join(doc.page_content for doc in docs)
+            return QAResponse(answer=EMPTY_SCOPE_ANSWER, refs=[])
+        context = self._retrieve_context(scope, texts, [question])
         llm = get_llm(temperature=0.1)
-        system_prompt = (
-            "You are an assistant answering questions strictly based on provided study materials. "
-            "Cite relevant sections when possible."
-        )
         prompt = f"Question: {question}\n\nContext:\n{context}"
         response = llm.invoke(
-            [SystemMessage(content=system_prompt), HumanMessage(content=prompt)]
+            [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)]
         )
         answer = getattr(response, "content", str(response))
         return QAResponse(answer=answer, refs=refs[:3])
 
+    def ask_batch(
+        self,
+        questions: List[str],
+        scope: str,
+        note_doc: NoteDoc | None,
+        cards: KnowledgeCards | None,
+        mock: MockPaper | None,
+    ) -> List[QAResponse]:
+        if len(questions) == 1:
+            return [self.ask(questions[0], scope, note_doc, cards, mock)]
+        texts, refs = self._collect_texts(scope, note_doc, cards, mock)
+        if not texts:
+            return [QAResponse(answer=EMPTY_SCOPE_ANSWER, refs=[]) for _ in questions]
+        context = self._retrieve_context(scope, texts, questions)
+        numbered = "\n".join(f"Q{index}: {question}" for index, question in enumerate(questions, start=1))
+        prompt = (
+            f"Questions:\n{numbered}\n\nContext:\n{context}\n\n"
+            f"Answer all {len(questions)} questions in order. Start each answer on a new line "
+            "with its label (A1:, A2:, ...) and do not repeat the questions."
+        )
+        llm = get_llm(temperature=0.1)
+        try:
+            response = llm.invoke(
+                [SystemMessage(content=SYSTEM_PROMPT), HumanMessage(content=prompt)]
+            )
+            answers = _split_answers(getattr(response, "content", str(response)), len(questions))
+        except Exception as exc:  # pragma: no cover - network guard
+            logger.warning("批量问答失败，逐条回答: %s", exc)
+            answers = {}
+        results: List[QAResponse] = []
+        for index, question in enumerate(questions, start=1):
+            answer = answers.get(index)
+            if answer:
+                results.append(QAResponse(answer=answer, refs=refs[:3]))
+            else:
+                # The model skipped or mislabelled this slot; answer it on its own.
+                results.append(self.ask(question, scope, note_doc, cards, mock))
+        return results
+
+    def _retrieve_context(self, scope: str, texts: List[str], questions: List[str]) -> str:
+        if len(texts) <= 3:
+            # Retrieval would return the whole corpus anyway; skip embedding it.
+            return "\n\n".join(texts)
+        store = self._get_store(scope, texts)
+        contents = {}
+        for docs in batch_similarity_search(store, questions, k=3):
+            for doc in docs:
+                contents.setdefault(doc.page_content, None)
+        return "\n\n".join(list(contents))
+
+    def _get_store(self, scope: str, texts: List[str]) -> FAISS:
+        digest = hashlib.blake2b("\x1f".join(texts).encode("utf-8"), digest_size=16).hexdigest()
+        key = (self.session_id, scope, digest)
+        embedding = get_embedding_model()
+        cache = QAService._store_cache
+        with QAService._store_cache_lock:
+            cached = cache.get(key)
+            if cached is not None and cached[0] is embedding:
+                cache.move_to_end(key)
+                return cached[1]
+        store = build_store([Document(page_content=text) for text in texts], embedding, gpu=True)
+        with QAService._store_cache_lock:
+            cache[key] = (embedding, store)
+            cache.move_to_end(key)
+            while len(cache) > QAService._store_cache_size:
+                cache.popitem(last=False)
+        return store
+
     def _collect_texts(
         self,
         scope: str,
@@ -63,4 +167,5 @@ class QAService:
                 item_text = f"{item.stem}\n答案: {item.answer}\n解析: {item.explain or ''}"
                 texts.append(item_text)
                 refs.extend(item.refs)
-        return texts, refs
+        # Sections, cards and questions often share anchors; keep first occurrences in order.
+        return texts, list(dict.fromkeys(ref for ref in refs if ref))
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import re
+from itertools import islice
 from typing import List
 
 from app.schemas.common import CardsPayload, KnowledgeCards, NoteDoc
-from app.utils.text import split_sentences
+from app.utils.text import cached_sentences
+
+EXAMPLE_PATTERN = re.compile(r"(例|示例|案例)[:：]\s*(.+)")
+BULLET_LINE_PATTERN = re.compile(r"^[^\S\r\n]*-.*$", re.MULTILINE)
 
 
 class KnowledgeCardGenerator:
@@ -26,17 +30,18 @@ class KnowledgeCardGenerator:
         return KnowledgeCards(cards=cards)
 
     def _extract_definition(self, markdown: str) -> str:
-        sentences = split_sentences(markdown.replace("\n", " "))
+        sentences = cached_sentences(markdown.replace("\n", " "))
         if sentences:
             return " ".join(sentences[:3])[:200]
         return "该概念在课程中用于支撑关键知识点，详见章节内容。"
 
     def _extract_exam_points(self, markdown: str) -> List[str]:
-        lines = [line.strip("- ").strip() for line in markdown.splitlines() if line.strip().startswith("-")]
-        return [line for line in lines[:3] if line]
+        bullets = islice(BULLET_LINE_PATTERN.finditer(markdown), 3)
+        points = (match.group(0).strip("- ").strip() for match in bullets)
+        return [point for point in points if point]
 
     def _extract_example(self, markdown: str):
-        match = re.search(r"(例|示例|案例)[:：]\s*(.+)", markdown)
+        match = EXAMPLE_PATTERN.search(markdown)
         if not match:
             return None
         content = match.group(2)
@@ -1,27 +1,25 @@
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Tuple
 
 from app.schemas.common import MindmapEdge, MindmapGraph, OutlineNode, OutlineTree
 
 
 class MindmapGenerator:
     def generate(self, outline: OutlineTree) -> MindmapGraph:
-        nodes = []
-        edges: List[MindmapEdge] = []
-        self._walk(outline.root, level=0, nodes=nodes, edges=edges, parent_id=None)
+        nodes: List[dict] = []
+        links = self._walk(outline.root, nodes)
+        edges = [MindmapEdge.model_construct(from_=parent_id, to=child_id) for parent_id, child_id in links]
         return MindmapGraph(nodes=nodes, edges=edges)
 
-    def _walk(
-        self,
-        node: OutlineNode,
-        level: int,
-        nodes: List[dict],
-        edges: List[MindmapEdge],
-        parent_id: str | None,
-    ) -> None:
-        nodes.append({"id": node.section_id, "label": node.title, "level": level})
-        if parent_id:
-            edges.append(MindmapEdge(**{"from": parent_id, "to": node.section_id}))
-        for child in node.children:
-            self._walk(child, level + 1, nodes, edges, node.section_id)
+    def _walk(self, root: OutlineNode, nodes: List[dict]) -> List[Tuple[str, str]]:
+        # Explicit pre-order stack: deep outlines cannot hit the recursion limit.
+        links: List[Tuple[str, str]] = []
+        stack: List[Tuple[OutlineNode, int, Optional[str]]] = [(root, 0, None)]
+        while stack:
+            node, level, parent_id = stack.pop()
+            nodes.append({"id": node.section_id, "label": node.title, "level": level})
+            if parent_id:
+                links.append((parent_id, node.section_id))
+            stack.extend((child, level + 1, node.section_id) for child in reversed(node.children))
+        return links
@@ -4,7 +4,13 @@ from typing import List
 
 from app.schemas.common import MockPaper, MockQuestion, NoteDoc
 from app.utils.identifiers import new_id
-from app.utils.text import split_sentences
+from app.utils.text import cached_sentences
+
+MCQ_DISTRACTORS = (
+    "{title} 与 {title} 无关。",
+    "{title} 仅涉及定义，不含推导。",
+    "{title} 不需要掌握。",
+)
 
 
 class MockExamGenerator:
@@ -12,7 +18,7 @@ class MockExamGenerator:
         questions: List[MockQuestion] = []
         sections = note_doc.sections if mode == "full" else note_doc.sections[:1]
         for section in sections:
-            sentences = split_sentences(section.body_md.replace("#", " "))
+            sentences = cached_sentences(section.body_md.replace("#", " "))
             summary = sentences[0] if sentences else section.title
             questions.append(self._build_mcq(section, summary))
             questions.append(self._build_fill(section, summary))
@@ -23,12 +29,8 @@ class MockExamGenerator:
 
     def _build_mcq(self, section, summary: str) -> MockQuestion:
         correct = summary
-        distractors = [
-            f"{section.title} 与 {section.title} 无关。",
-            f"{section.title} 仅涉及定义，不含推导。",
-            f"{section.title} 不需要掌握。",
-        ]
-        options = [correct] + distractors
+        title = section.title
+        options = [correct, *(template.format(title=title) for template in MCQ_DISTRACTORS)]
         return MockQuestion(
             id=new_id("q"),
             type="mcq",
@@ -3,15 +3,19 @@ from __future__ import annotations
 import json
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Callable, Optional
 
+import orjson
+
 from app.configs.settings import settings
 from app.modules.chunk_outline.outline_builder import OutlineBuilder
 from app.modules.layout_ocr.layout_builder import LayoutBuilder
 from app.modules.note.generator import NoteGenerator
 from app.modules.parser.slide_parser import SlideParser
+from app.modules.qa.qa_service import QAService
 from app.modules.templates.cards import KnowledgeCardGenerator
 from app.modules.templates.mindmap import MindmapGenerator
 from app.modules.templates.mock_exam import MockExamGenerator
@@ -23,7 +27,7 @@ from app.schemas.common import (
     OutlineTree,
     ParseResponse,
 )
-from app.storage import uploads
+from app.storage import assets, uploads, vector_store
 from app.storage.database import notes_db, slides_db
 from app.storage.repository import repository
 from app.utils.identifiers import new_id
@@ -127,6 +131,9 @@ class CourseSessionManager:
         logger.info("开始删除会话: session_id=%s file_id=%s", session_id, file_id)
         self._purge_relational_data(session_id)
         released_bytes = self._purge_session_files(session_id, file_id)
+        assets.forget_session(session_id)
+        QAService.invalidate(session_id)
+        vector_store.evict(session_id)
         logger.info("会话删除完成: session_id=%s 释放 %.2f KB", session_id, released_bytes / 1024 or 0.0)
         return {
             "session_id": session_id,
@@ -135,32 +142,35 @@ class CourseSessionManager:
 
     def _purge_relational_data(self, session_id: str) -> None:
         with slides_db.connect() as conn:
-            cursor = conn.execute(
-                "SELECT id FROM slide WHERE course_session_id=?",
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM block WHERE slide_id IN "
+                "(SELECT id FROM slide WHERE course_session_id=?)",
                 (session_id,),
             )
-            slide_ids = [row[0] for row in cursor.fetchall()]
-            if slide_ids:
-                conn.executemany(
-                    "DELETE FROM block WHERE slide_id=?",
-                    ((slide_id,) for slide_id in slide_ids),
-                )
             conn.execute("DELETE FROM slide WHERE course_session_id=?", (session_id,))
             conn.execute("DELETE FROM outline_node WHERE course_session_id=?", (session_id,))
             conn.execute("DELETE FROM artifact WHERE course_session_id=?", (session_id,))
             conn.execute("DELETE FROM course_session WHERE id=?", (session_id,))
         with notes_db.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute("DELETE FROM note_doc WHERE course_session_id=?", (session_id,))
             conn.execute("DELETE FROM artifact WHERE course_session_id=?", (session_id,))
 
     def _purge_session_files(self, session_id: str, file_id: str | None) -> int:
-        released = 0
+        jobs: list[tuple[Callable[..., int], object]] = [
+            (self._delete_path, ASSET_ROOT / session_id),
+            (self._delete_path, EXPORT_ROOT / session_id),
+            (self._delete_vector_files, session_id),
+        ]
         if file_id:
-            released += self._delete_upload_files(file_id)
-        released += self._delete_path(ASSET_ROOT / session_id)
-        released += self._delete_path(EXPORT_ROOT / session_id)
-        released += self._delete_vector_files(session_id)
-        return released
+            jobs.append((self._delete_upload_files, file_id))
+        if not settings.storage.parallel_delete:
+            return sum(job(arg) for job, arg in jobs)
+        # Each job touches a disjoint path, so the directory walks can overlap freely.
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(job, arg) for job, arg in jobs]
+            return sum(future.result() for future in futures)
 
     def _delete_upload_files(self, file_id: str) -> int:
         released = 0
@@ -201,28 +211,43 @@ class CourseSessionManager:
         return 0
 
 
+# Pipeline components hold no per-session state, so every pipeline shares one set.
+_PARSER = SlideParser(
+    max_workers=settings.parser.max_workers,
+    parallel_min_pages=settings.parser.parallel_min_pages,
+    pdf_engine=settings.parser.pdf_engine,
+)
+_LAYOUT_BUILDER = LayoutBuilder()
+_OUTLINE_BUILDER = OutlineBuilder()
+_NOTE_GENERATOR = NoteGenerator(
+    chunk_size=settings.rag.chunk.max_tokens,
+    chunk_overlap=settings.rag.chunk.overlap,
+    max_workers=settings.rag.note_max_workers,
+)
+_CARDS_GENERATOR = KnowledgeCardGenerator()
+_MOCK_GENERATOR = MockExamGenerator()
+_MINDMAP_GENERATOR = MindmapGenerator()
+_SESSION_MANAGER = CourseSessionManager()
+
+
 class CourseSessionPipeline:
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.parser = SlideParser()
-        self.layout_builder = LayoutBuilder()
-        self.outline_builder = OutlineBuilder()
-        self.note_generator = NoteGenerator(
-            chunk_size=settings.rag.chunk.max_tokens,
-            chunk_overlap=settings.rag.chunk.overlap,
-            max_workers=settings.rag.note_max_workers,
-        )
-        self.cards_generator = KnowledgeCardGenerator()
-        self.mock_generator = MockExamGenerator()
-        self.mindmap_generator = MindmapGenerator()
-        self.manager = CourseSessionManager()
+        self.parser = _PARSER
+        self.layout_builder = _LAYOUT_BUILDER
+        self.outline_builder = _OUTLINE_BUILDER
+        self.note_generator = _NOTE_GENERATOR
+        self.cards_generator = _CARDS_GENERATOR
+        self.mock_generator = _MOCK_GENERATOR
+        self.mindmap_generator = _MINDMAP_GENERATOR
+        self.manager = _SESSION_MANAGER
 
     def parse(self, file_id: str, file_type: str) -> ParseResponse:
         file_path = uploads.get_path(file_id)
         logger.info("开始解析: session_id=%s file_id=%s path=%s", self.session_id, file_id, file_path)
         parsed = self.parser.parse(file_path, file_type, self.session_id)
         repository.save_artifact(
-            self.session_id, "parse", parsed.model_dump(), artifact_id=f"parse_{self.session_id}"
+            self.session_id, "parse", parsed.model_dump(mode="json", exclude_none=True), artifact_id=f"parse_{self.session_id}"
         )
         self.manager.update_status(self.session_id, "PARSED")
         return parsed
@@ -232,7 +257,7 @@ class CourseSessionPipeline:
         logger.info("构建版式: session_id=%s", self.session_id)
         layout = self.layout_builder.build(parsed)
         repository.save_artifact(
-            self.session_id, "layout", layout.model_dump(), artifact_id=f"layout_{self.session_id}"
+            self.session_id, "layout", layout.model_dump(mode="json", exclude_none=True), artifact_id=f"layout_{self.session_id}"
         )
         self.manager.update_status(self.session_id, "LAYOUT_BUILT")
         return layout
@@ -243,7 +268,7 @@ class CourseSessionPipeline:
         logger.info("生成大纲: session_id=%s", self.session_id)
         outline = self.outline_builder.build(layout, parsed.doc_meta.get("title", "课程材料"))
         repository.save_artifact(
-            self.session_id, "outline", outline.model_dump(), artifact_id=f"outline_{self.session_id}"
+            self.session_id, "outline", outline.model_dump(mode="json", exclude_none=True), artifact_id=f"outline_{self.session_id}"
         )
         self.manager.update_status(self.session_id, "OUTLINE_READY")
         return outline
@@ -286,7 +311,8 @@ class CourseSessionPipeline:
         if progress_callback:
             progress_callback({"phase": "save", "message": "整理并保存生成结果…"})
         note_id = f"note_{self.session_id}_{detail_level}_{difficulty}_{language}"
-        repository.save_artifact(self.session_id, "note_doc", note_doc.model_dump(), artifact_id=note_id)
+        dumped = note_doc.model_dump(mode="json", exclude_none=True)
+        repository.save_artifact(self.session_id, "note_doc", dumped, artifact_id=note_id)
         notes_db.upsert(
             "note_doc",
             {
@@ -295,10 +321,11 @@ class CourseSessionPipeline:
                 "style_detail": detail_level,
                 "style_difficulty": difficulty,
                 "style_language": language,
-                "content_md": json.dumps([s.model_dump() for s in note_doc.sections], ensure_ascii=False),
-                "toc_json": json.dumps(note_doc.toc, ensure_ascii=False),
+                "content_md": orjson.dumps(dumped["sections"]).decode(),
+                "toc_json": orjson.dumps(dumped["toc"]).decode(),
             },
         )
+        QAService.invalidate(self.session_id, "notes")
         self.manager.update_status(self.session_id, "NOTES_READY")
         return note_id, note_doc
 
@@ -307,8 +334,9 @@ class CourseSessionPipeline:
         cards = self.cards_generator.generate(note_doc)
         cards_id = f"cards_{note_doc_id}"
         repository.save_artifact(
-            self.session_id, "cards", cards.model_dump(), artifact_id=cards_id
+            self.session_id, "cards", cards.model_dump(mode="json", exclude_none=True), artifact_id=cards_id
         )
+        QAService.invalidate(self.session_id, "cards")
         self.manager.update_status(self.session_id, "TEMPLATES_READY")
         return cards_id, cards
 
@@ -317,8 +345,9 @@ class CourseSessionPipeline:
         paper = self.mock_generator.generate(note_doc, mode, size, difficulty)
         paper_id = f"mock_{note_doc_id}_{mode}_{size}"
         repository.save_artifact(
-            self.session_id, "mock", paper.model_dump(), artifact_id=paper_id
+            self.session_id, "mock", paper.model_dump(mode="json", exclude_none=True), artifact_id=paper_id
         )
+        QAService.invalidate(self.session_id, "mock")
         self.manager.update_status(self.session_id, "TEMPLATES_READY")
         return paper_id, paper
 
@@ -327,35 +356,35 @@ class CourseSessionPipeline:
         graph = self.mindmap_generator.generate(outline)
         graph_id = f"mindmap_{self.session_id}"
         repository.save_artifact(
-            self.session_id, "mindmap", graph.model_dump(), artifact_id=graph_id
+            self.session_id, "mindmap", graph.model_dump(mode="json", exclude_none=True), artifact_id=graph_id
         )
         return graph_id, graph.model_dump()
 
     def _load_parse(self) -> ParseResponse:
-        payload = repository.load_artifact(f"parse_{self.session_id}")
-        if not payload:
+        parsed = repository.load_artifact_typed(f"parse_{self.session_id}", ParseResponse)
+        if parsed is None:
             logger.error("解析数据缺失: session_id=%s", self.session_id)
             raise ValueError("parse stage not completed")
-        return ParseResponse(**payload)
+        return parsed
 
     def _load_layout(self) -> LayoutDoc:
-        payload = repository.load_artifact(f"layout_{self.session_id}")
-        if not payload:
+        layout = repository.load_artifact_typed(f"layout_{self.session_id}", LayoutDoc)
+        if layout is None:
             logger.warning("layout 缓存缺失，重新生成: session_id=%s", self.session_id)
             layout = self.build_layout()
             return layout
-        return LayoutDoc(**payload)
+        return layout
 
     def _load_outline(self) -> OutlineTree:
-        payload = repository.load_artifact(f"outline_{self.session_id}")
-        if not payload:
+        outline = repository.load_artifact_typed(f"outline_{self.session_id}", OutlineTree)
+        if outline is None:
             logger.warning("outline 缓存缺失，重新生成: session_id=%s", self.session_id)
             outline = self.build_outline()
             return outline
-        return OutlineTree(**payload)
+        return outline
 
     def _load_note(self, note_doc_id: str) -> NoteDoc:
-        payload = repository.load_artifact(note_doc_id)
-        if not payload:
+        note_doc = repository.load_artifact_typed(note_doc_id, NoteDoc)
+        if note_doc is None:
             raise ValueError(f"note doc {note_doc_id} not found")
-        return NoteDoc(**payload)
+        return note_doc
@@ -5,7 +5,7 @@ from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
-from app.schemas.common import NoteDoc
+from app.schemas.common import NoteDoc, QAResponse
 
 
 class FileType(str, Enum):
@@ -107,6 +107,16 @@ class QARequest(BaseModel):
     scope: Literal["notes", "cards", "mock"]
 
 
+class QABatchRequest(BaseModel):
+    session_id: str
+    questions: List[str] = Field(min_length=1, max_length=20)
+    scope: Literal["notes", "cards", "mock"]
+
+
+class QABatchResponse(BaseModel):
+    answers: List[QAResponse]
+
+
 class SessionSummary(BaseModel):
     id: str
     title: str
@@ -0,0 +1,69 @@
+"""
+Validation-free model construction for payloads this service serialized itself.
+
+``construct_trusted`` rebuilds nested models, lists, dicts and enums from a
+``model_dump()`` payload via ``model_construct``, skipping field validation.
+Never use it on client input.
+"""
+
+from __future__ import annotations
+
+import enum
+import types
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Converter = Callable[[Any], Any]
+
+
+def construct_trusted(model_cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    converters = _field_converters(model_cls)
+    values: Dict[str, Any] = {}
+    for key, value in data.items():
+        converter = converters.get(key)
+        values[key] = value if converter is None or value is None else converter(value)
+    return model_cls.model_construct(**values)
+
+
+@lru_cache(maxsize=None)
+def _field_converters(model_cls: Type[BaseModel]) -> Dict[str, Converter]:
+    converters: Dict[str, Converter] = {}
+    for name, field in model_cls.model_fields.items():
+        converter = _converter_for(field.annotation)
+        if converter is None:
+            continue
+        converters[name] = converter
+        if field.alias:
+            converters[field.alias] = converter
+    return converters
+
+
+def _converter_for(annotation: Any) -> Optional[Converter]:
+    origin = get_origin(annotation)
+    if origin is Union or origin is types.UnionType:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        # Only Optional[X] is unambiguous; real unions are left untouched.
+        return _converter_for(members[0]) if len(members) == 1 else None
+    if origin is list:
+        args = get_args(annotation)
+        item = _converter_for(args[0]) if args else None
+        if item is None:
+            return None
+        return lambda values: [value if value is None else item(value) for value in values]
+    if origin is dict:
+        args = get_args(annotation)
+        item = _converter_for(args[1]) if len(args) == 2 else None
+        if item is None:
+            return None
+        return lambda mapping: {
+            key: value if value is None else item(value) for key, value in mapping.items()
+        }
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return lambda value: value if isinstance(value, annotation) else construct_trusted(annotation, value)
+        if issubclass(annotation, enum.Enum):
+            return lambda value: value if isinstance(value, annotation) else annotation(value)
+    return None
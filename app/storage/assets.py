@@ -5,25 +5,52 @@ Utility for storing page-level assets (images, tables, formulas) on disk.
 from __future__ import annotations
 
 import os
+import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import BinaryIO
+from typing import BinaryIO, Iterator, Tuple
 
 ASSET_ROOT = Path(os.getenv("SC_ASSET_ROOT", "assets"))
 ASSET_ROOT.mkdir(exist_ok=True)
+COPY_CHUNK_BYTES = 1 << 20
+# Session directories already created by this process; saves a mkdir per extracted image.
+_CREATED_DIRS: set[str] = set()
 
 
 def session_dir(session_id: str) -> Path:
     path = ASSET_ROOT / session_id
-    path.mkdir(parents=True, exist_ok=True)
+    if session_id not in _CREATED_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _CREATED_DIRS.add(session_id)
     return path
 
 
-def write_asset(session_id: str, filename: str, data: bytes) -> str:
+def forget_session(session_id: str) -> None:
+    # Called when a session is deleted so a recreated directory gets its mkdir again.
+    _CREATED_DIRS.discard(session_id)
+
+
+@contextmanager
+def _open_asset(session_id: str, filename: str) -> Iterator[Tuple[Path, BinaryIO]]:
     path = session_dir(session_id) / filename
-    with open(path, "wb") as fh:
+    try:
+        fh = open(path, "wb")
+    except FileNotFoundError:
+        # The directory was removed behind the cache (e.g. the session was deleted).
+        _CREATED_DIRS.discard(session_id)
+        path = session_dir(session_id) / filename
+        fh = open(path, "wb")
+    with fh:
+        yield path, fh
+
+
+def write_asset(session_id: str, filename: str, data: bytes) -> str:
+    with _open_asset(session_id, filename) as (path, fh):
         fh.write(data)
     return str(path)
 
 
 def save_stream(session_id: str, filename: str, stream: BinaryIO) -> str:
-    return write_asset(session_id, filename, stream.read())
+    with _open_asset(session_id, filename) as (path, fh):
+        shutil.copyfileobj(stream, fh, COPY_CHUNK_BYTES)
+    return str(path)
@@ -8,12 +8,16 @@ SQLite helper for StudyCompanion.
 
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
+import threading
+import weakref
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import orjson
 
 from app.utils.logger import logger
 
@@ -62,8 +66,10 @@ CREATE TABLE IF NOT EXISTS artifact (
     id TEXT PRIMARY KEY,
     course_session_id TEXT,
     kind TEXT,
-    payload_json TEXT
+    payload_json TEXT,
+    payload_msgpack BLOB
 );
+CREATE INDEX IF NOT EXISTS idx_artifact_session_kind ON artifact(course_session_id, kind);
 """
 
 NOTES_SCHEMA = """
@@ -80,25 +86,73 @@ CREATE TABLE IF NOT EXISTS artifact (
     id TEXT PRIMARY KEY,
     course_session_id TEXT,
     kind TEXT,
-    payload_json TEXT
+    payload_json TEXT,
+    payload_msgpack BLOB
 );
+CREATE INDEX IF NOT EXISTS idx_artifact_session_kind ON artifact(course_session_id, kind);
 """
 
+# Applied to every connection; WAL lets readers proceed while a note is being written.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=1073741824",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
+
+
+class _ThreadConnection:
+    # Lives only in the owning thread's threading.local; when the thread exits the holder is
+    # collected and the finalizer closes its connection.
+    __slots__ = ("conn", "close", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.close = weakref.finalize(self, conn.close)
+
 
 class Database:
     def __init__(self, path: Path, schema: str):
         self.path = path
         self.schema = schema
+        # One connection per thread, reused across calls. Holders are tracked weakly so
+        # close_all can reach live ones without keeping retired threads' connections open.
+        self._local = threading.local()
+        self._holders: "weakref.WeakSet[_ThreadConnection]" = weakref.WeakSet()
+        self._holders_lock = threading.Lock()
         self._ensure_schema()
 
     @contextmanager
     def connect(self):
-        conn = sqlite3.connect(self.path)
+        conn = self._thread_connection()
+        conn.row_factory = None
         try:
             yield conn
             conn.commit()
-        finally:
-            conn.close()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _thread_connection(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            holder = _ThreadConnection(conn)
+            self._local.holder = holder
+            with self._holders_lock:
+                self._holders.add(holder)
+        return holder.conn
+
+    def close_all(self) -> None:
+        with self._holders_lock:
+            holders = list(self._holders)
+            self._holders = weakref.WeakSet()
+        for holder in holders:
+            holder.close()
+        self._local = threading.local()
 
     def _ensure_schema(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
@@ -107,9 +161,7 @@ class Database:
         logger.info("数据库初始化完成: %s", self.path)
 
     def upsert(self, table: str, data: Dict[str, Any]) -> None:
-        keys = ", ".join(data.keys())
-        placeholders = ", ".join([":" + k for k in data.keys()])
-        sql = f"INSERT OR REPLACE INTO {table} ({keys}) VALUES ({placeholders})"
+        sql = _upsert_sql(table, tuple(data))
         with self.connect() as conn:
             conn.execute(sql, data)
 
@@ -131,7 +183,7 @@ class Database:
             payload = dict(row)
             for key, value in payload.items():
                 if key.endswith("_json") and value:
-                    payload[key] = json.loads(value)
+                    payload[key] = orjson.loads(value)
             return payload
 
     def fetch_all(
@@ -151,6 +203,15 @@ class Database:
                 logger.info("新增列: %s.%s", table, column)
 
 
+@lru_cache(maxsize=64)
+def _upsert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    keys = ", ".join(columns)
+    placeholders = ", ".join([":" + k for k in columns])
+    return f"INSERT OR REPLACE INTO {table} ({keys}) VALUES ({placeholders})"
+
+
 slides_db = Database(SLIDES_DB_PATH, SLIDES_SCHEMA)
 notes_db = Database(NOTES_DB_PATH, NOTES_SCHEMA)
 notes_db.ensure_column("note_doc", "style_language", "TEXT")
+slides_db.ensure_column("artifact", "payload_msgpack", "BLOB")
+notes_db.ensure_column("artifact", "payload_msgpack", "BLOB")
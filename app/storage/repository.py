@@ -1,19 +1,37 @@
 from __future__ import annotations
 
-import json
-from typing import Any, Optional
+from typing import Any, Optional, Type, TypeVar
 
+import msgspec
+import orjson
+from pydantic import BaseModel
+
+from app.schemas.trusted import construct_trusted
 from app.storage.database import notes_db, slides_db
 from app.utils.identifiers import new_id
 
 
 SLIDE_ARTIFACT_KINDS = {"parse", "layout", "outline"}
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+_MSGPACK_DECODER = msgspec.msgpack.Decoder()
 
 
 def _db_for_kind(kind: str):
     return slides_db if kind in SLIDE_ARTIFACT_KINDS else notes_db
 
 
+def _decode_payload(payload_json: Optional[str], payload_msgpack: Optional[bytes]) -> Any:
+    # New rows only carry msgpack; rows written before the column existed only carry JSON.
+    if payload_msgpack is not None:
+        return _MSGPACK_DECODER.decode(payload_msgpack)
+    if payload_json:
+        return orjson.loads(payload_json)
+    return None
+
+
 class Repository:
     def save_artifact(self, session_id: str, kind: str, payload: Any, artifact_id: str | None = None) -> str:
         ident = artifact_id or new_id(kind)
@@ -24,32 +42,40 @@ class Repository:
                 "id": ident,
                 "course_session_id": session_id,
                 "kind": kind,
-                "payload_json": json.dumps(payload, ensure_ascii=False),
+                "payload_json": None,
+                "payload_msgpack": _MSGPACK_ENCODER.encode(payload),
             },
         )
         return ident
 
     def load_artifact(self, artifact_id: str) -> Optional[Any]:
-        row = slides_db.fetch_json("artifact", artifact_id)
+        sql = "SELECT payload_json, payload_msgpack FROM artifact WHERE id=? LIMIT 1"
+        # Artifact ids start with their kind ("parse_…", "note_…"), which names the owning database.
+        primary = _db_for_kind(artifact_id.partition("_")[0])
+        row = primary.fetchone(sql, (artifact_id,))
         if not row:
-            row = notes_db.fetch_json("artifact", artifact_id)
+            fallback = notes_db if primary is slides_db else slides_db
+            row = fallback.fetchone(sql, (artifact_id,))
         if not row:
             return None
-        return row.get("payload_json")
+        return _decode_payload(row["payload_json"], row["payload_msgpack"])
+
+    def load_artifact_typed(self, artifact_id: str, model_cls: Type[ModelT]) -> Optional[ModelT]:
+        # Payloads were dumped from validated models by this service, so skip re-validation.
+        payload = self.load_artifact(artifact_id)
+        if not payload:
+            return None
+        return construct_trusted(model_cls, payload)
 
     def list_artifacts(self, session_id: str, kind: str) -> list[tuple[str, Any]]:
         database = _db_for_kind(kind)
         with database.connect() as conn:
             conn.row_factory = None
             cursor = conn.execute(
-                "SELECT id, payload_json FROM artifact WHERE course_session_id=? AND kind=?",
+                "SELECT id, payload_json, payload_msgpack FROM artifact WHERE course_session_id=? AND kind=?",
                 (session_id, kind),
             )
-            results = []
-            for row in cursor.fetchall():
-                payload = json.loads(row[1])
-                results.append((row[0], payload))
-            return results
+            return [(row[0], _decode_payload(row[1], row[2])) for row in cursor.fetchall()]
 
     def list_artifact_ids(self, session_id: str, kind: str) -> list[str]:
         database = _db_for_kind(kind)
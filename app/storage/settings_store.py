@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-import json
+import copy
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
 
 from app.utils.logger import logger
 
@@ -12,21 +14,38 @@ RUNTIME_SETTINGS_PATH = Path(
 )
 
 
+# Parsed settings keyed by the file's mtime; callers get a deep copy so they can mutate freely.
+_CACHE: Optional[Tuple[int, Dict[str, Any]]] = None
+
+
 def _load_all() -> Dict[str, Any]:
-    if not RUNTIME_SETTINGS_PATH.exists():
+    global _CACHE
+    try:
+        mtime = RUNTIME_SETTINGS_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    except OSError as exc:
+        logger.warning("加载运行时配置失败，将使用默认值: %s", exc)
         return {}
+    cached = _CACHE
+    if cached is not None and cached[0] == mtime:
+        return copy.deepcopy(cached[1])
     try:
-        with open(RUNTIME_SETTINGS_PATH, "r", encoding="utf-8") as fh:
-            return json.load(fh)
-    except (json.JSONDecodeError, OSError) as exc:
+        with open(RUNTIME_SETTINGS_PATH, "rb") as fh:
+            data = orjson.loads(fh.read())
+    except (orjson.JSONDecodeError, OSError) as exc:
         logger.warning("加载运行时配置失败，将使用默认值: %s", exc)
         return {}
+    _CACHE = (mtime, data)
+    return copy.deepcopy(data)
 
 
 def _save_all(payload: Dict[str, Any]) -> None:
+    global _CACHE
     RUNTIME_SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(RUNTIME_SETTINGS_PATH, "w", encoding="utf-8") as fh:
-        json.dump(payload, fh, ensure_ascii=False, indent=2)
+    with open(RUNTIME_SETTINGS_PATH, "wb") as fh:
+        fh.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    _CACHE = (RUNTIME_SETTINGS_PATH.stat().st_mtime_ns, copy.deepcopy(payload))
 
 
 def get_llm_settings() -> Dict[str, Any]:
@@ -1,20 +1,23 @@
 from __future__ import annotations
 
 import os
+import shutil
 from pathlib import Path
+from typing import BinaryIO
 
 from app.utils.identifiers import new_id
 
 UPLOAD_ROOT = Path(os.getenv("SC_UPLOAD_ROOT", "uploads"))
 UPLOAD_ROOT.mkdir(exist_ok=True)
+COPY_CHUNK_BYTES = 1 << 20
 
 
-def save_upload(filename: str, data: bytes) -> tuple[str, Path]:
+def save_upload(filename: str, stream: BinaryIO) -> tuple[str, Path]:
     file_id = new_id("file")
     ext = Path(filename).suffix or ""
     path = UPLOAD_ROOT / f"{file_id}{ext}"
     with open(path, "wb") as fh:
-        fh.write(data)
+        shutil.copyfileobj(stream, fh, COPY_CHUNK_BYTES)
     return file_id, path
 
 
@@ -4,38 +4,305 @@ Vector store adapter built on FAISS with LangChain abstractions.
 
 from __future__ import annotations
 
+import hashlib
+import math
 import os
+import pickle
+import platform
+import shutil
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
 
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
 
+from app.configs.settings import settings
 from app.modules.note.llm_client import get_embedding_model
+from app.utils.logger import logger
 
 VECTOR_ROOT = Path(os.getenv("SC_VECTOR_ROOT", ".vectors"))
 VECTOR_ROOT.mkdir(exist_ok=True)
 
+# Below this many vectors a flat scan is as fast as IVF and needs no training.
+IVF_MIN_VECTORS = 1000
+PQ_SUBQUANTIZERS = 8
+PQ_BITS = 8
+# FAISS k-means wants at least this many training points per centroid.
+MIN_POINTS_PER_CENTROID = 39
+# Texts per embed_documents call when rag.embed_batch_size is 0, keyed by embedding class.
+PROVIDER_EMBED_BATCH_SIZES = {"OpenAIEmbeddings": 96, "GoogleGenerativeAIEmbeddings": 100}
+DEFAULT_EMBED_BATCH_SIZE = 64
+
+# Loaded note stores keyed by session id, as (corpus digest, embedding, store); LRU bounded.
+STORE_CACHE_SIZE = 16
+_store_cache: "OrderedDict[str, Tuple[str, Any, FAISS]]" = OrderedDict()
+_store_cache_lock = threading.Lock()
+# Serialises saves of the same session so its .faiss/.pkl pair is always written together.
+_SAVE_LOCKS = tuple(threading.Lock() for _ in range(16))
+
 
 def _session_path(session_id: str) -> Path:
     return VECTOR_ROOT / f"{session_id}.faiss"
 
 
+def _docstore_path(session_id: str) -> Path:
+    return VECTOR_ROOT / f"{session_id}.pkl"
+
+
+def _corpus_digest(texts: Sequence[str]) -> str:
+    return hashlib.blake2b("\x1f".join(texts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Persisted next to each index: vectors are only reusable by the embedder that produced them.
+def _embedding_identity(embedding) -> Tuple[str, str, int]:
+    model = getattr(embedding, "model", None) or getattr(embedding, "model_name", None) or ""
+    # Output width when the embedder declares it (OpenAI `dimensions`, fake embedders `size`).
+    dims = getattr(embedding, "dimensions", None) or getattr(embedding, "size", None) or 0
+    return type(embedding).__name__, str(model), int(dims)
+
+
+@lru_cache(maxsize=1)
+def _configure_faiss() -> None:
+    options = faiss.get_compile_options()
+    logger.info("FAISS 编译选项: %s", options.strip())
+    if platform.machine().lower() in {"x86_64", "amd64"} and "AVX2" not in options:
+        logger.warning("当前 FAISS 未启用 AVX2 内核，向量检索将使用通用实现")
+    threads = settings.rag.faiss_omp_threads
+    if threads > 0:
+        faiss.omp_set_num_threads(threads)
+
+
 def load_or_create(session_id: str, docs: Optional[Iterable[Document]] = None) -> FAISS:
-    path = _session_path(session_id)
-    if path.exists() and (path.with_suffix(".pkl")).exists():
-        return FAISS.load_local(
-            str(path),
-            get_embedding_model(),
-            allow_dangerous_deserialization=True,
-        )
+    _configure_faiss()
+    embedding = get_embedding_model()
+    docs = list(docs) if docs is not None else None
+    digest = _corpus_digest([doc.page_content for doc in docs]) if docs is not None else None
+    store = _cached(session_id, embedding, digest)
+    if store is not None:
+        return store
+    store = _load(session_id, embedding, digest)
+    if store is not None:
+        _remember(session_id, digest or _store_digest(store), store)
+        return store
     if docs is None:
         raise ValueError("docs required for new vector store")
-    store = FAISS.from_documents(docs, embedding=get_embedding_model())
-    store.save_local(str(path))
+    store = build_store(docs, embedding)
+    save(session_id, store, digest)
     return store
 
 
-def save(session_id: str, store: FAISS) -> None:
-    path = _session_path(session_id)
-    store.save_local(str(path))
+def _cached(session_id: str, embedding, digest: Optional[str]) -> Optional[FAISS]:
+    with _store_cache_lock:
+        entry = _store_cache.get(session_id)
+        if entry is None or entry[1] is not embedding or (digest is not None and entry[0] != digest):
+            return None
+        _store_cache.move_to_end(session_id)
+        return entry[2]
+
+
+def _remember(session_id: str, digest: str, store: FAISS) -> None:
+    with _store_cache_lock:
+        _store_cache[session_id] = (digest, store.embedding_function, store)
+        _store_cache.move_to_end(session_id)
+        while len(_store_cache) > STORE_CACHE_SIZE:
+            _store_cache.popitem(last=False)
+
+
+def evict(session_id: str) -> None:
+    with _store_cache_lock:
+        _store_cache.pop(session_id, None)
+
+
+def _load(session_id: str, embedding, digest: Optional[str]) -> Optional[FAISS]:
+    index_path = _session_path(session_id)
+    docstore_path = _docstore_path(session_id)
+    if not index_path.is_file() or not docstore_path.is_file():
+        return None
+    with open(docstore_path, "rb") as fh:
+        payload = pickle.load(fh)
+    if len(payload) != 5:
+        # Saved before the embedding identity was recorded; rebuild once.
+        return None
+    docstore, index_to_docstore_id, saved_digest, identity, dim = payload
+    if digest is not None and saved_digest != digest:
+        # The layout was rebuilt since this index was saved.
+        return None
+    if identity != _embedding_identity(embedding):
+        # Vectors from another provider or model cannot be queried with this embedder.
+        logger.info("嵌入模型已变更，重建向量索引: session_id=%s", session_id)
+        return None
+    try:
+        # Page vectors in lazily instead of copying the whole index into memory.
+        index = faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except RuntimeError:
+        index = faiss.read_index(str(index_path))
+    if index.d != dim:
+        return None
+    _apply_nprobe(index)
+    return FAISS(
+        embedding_function=embedding,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
+
+
+# Only pass gpu=True for stores that are never persisted: write_index cannot write GPU indexes.
+def build_store(docs: List[Document], embedding, gpu: bool = False) -> FAISS:
+    _configure_faiss()
+    texts = [doc.page_content for doc in docs]
+    vectors = _embed_batch(embedding, texts, _embed_batch_size(embedding), settings.rag.embed_max_workers)
+    index_type = settings.rag.faiss_index_type
+    if index_type == "flat" or len(docs) < IVF_MIN_VECTORS:
+        store = FAISS.from_embeddings(
+            list(zip(texts, vectors)),
+            embedding,
+            metadatas=[doc.metadata for doc in docs],
+        )
+        if gpu:
+            store.index = _to_gpu(store.index)
+        return store
+    index = _build_ivf_index(np.asarray(vectors, dtype="float32"), use_pq=index_type == "ivfpq")
+    if gpu:
+        index = _to_gpu(index)
+    ids = [str(uuid.uuid4()) for _ in docs]
+    return FAISS(
+        embedding_function=embedding,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def _embed_batch_size(embedding) -> int:
+    configured = settings.rag.embed_batch_size
+    if configured > 0:
+        return configured
+    return PROVIDER_EMBED_BATCH_SIZES.get(type(embedding).__name__, DEFAULT_EMBED_BATCH_SIZE)
+
+
+def _embed_batch(
+    embedding, texts: List[str], batch_size: int = 64, max_workers: int = 1
+) -> List[List[float]]:
+    batch_size = max(1, batch_size)
+    batches = [texts[start : start + batch_size] for start in range(0, len(texts), batch_size)]
+    vectors: List[List[float]] = []
+    if len(batches) <= 1 or max_workers <= 1:
+        for batch in batches:
+            vectors.extend(embedding.embed_documents(batch))
+        return vectors
+    # Embedding calls are network bound; map() keeps the batches in input order.
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+        for batch_vectors in pool.map(embedding.embed_documents, batches):
+            vectors.extend(batch_vectors)
+    return vectors
+
+
+def _build_ivf_index(vectors: np.ndarray, use_pq: bool):
+    count, dim = vectors.shape
+    # sqrt(N) lists, but never more than the coarse quantizer can be trained for.
+    nlist = max(1, min(int(math.sqrt(count)), count // MIN_POINTS_PER_CENTROID))
+    quantizer = faiss.IndexFlatL2(dim)
+    # Each PQ sub-quantizer trains 2**PQ_BITS centroids; below that many points fall back to IVFFlat.
+    pq_trainable = count >= MIN_POINTS_PER_CENTROID * 2**PQ_BITS
+    if use_pq and dim % PQ_SUBQUANTIZERS == 0 and pq_trainable:
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, PQ_SUBQUANTIZERS, PQ_BITS)
+    else:
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+    index.train(vectors)
+    index.add(vectors)
+    _apply_nprobe(index)
+    logger.info("构建 IVF 向量索引: vectors=%s nlist=%s pq=%s", count, nlist, isinstance(index, faiss.IndexIVFPQ))
+    return index
+
+
+@lru_cache(maxsize=1)
+def _gpu_resources():
+    if not settings.rag.use_gpu_faiss or not hasattr(faiss, "StandardGpuResources"):
+        return None
+    if faiss.get_num_gpus() <= 0:
+        logger.warning("已启用 use_gpu_faiss，但未检测到可用 GPU，继续使用 CPU 索引")
+        return None
+    return faiss.StandardGpuResources()
+
+
+def _to_gpu(index):
+    resources = _gpu_resources()
+    if resources is None:
+        return index
+    return faiss.index_cpu_to_gpu(resources, 0, index)
+
+
+def batch_similarity_search(store: FAISS, queries: List[str], k: int) -> List[List[Document]]:
+    if not queries:
+        return []
+    embed_query = store.embedding_function.embed_query
+    vectors = np.asarray([embed_query(query) for query in queries], dtype="float32")
+    _, indices = store.index.search(vectors, min(k, store.index.ntotal))
+    results: List[List[Document]] = []
+    for row in indices:
+        docs: List[Document] = []
+        for position in row:
+            if position == -1:
+                continue
+            doc = store.docstore.search(store.index_to_docstore_id[int(position)])
+            if isinstance(doc, Document):
+                docs.append(doc)
+        results.append(docs)
+    return results
+
+
+def _apply_nprobe(index) -> None:
+    if hasattr(index, "nprobe"):
+        index.nprobe = settings.rag.faiss_nprobe
+
+
+def save(session_id: str, store: FAISS, digest: Optional[str] = None) -> None:
+    index_path = _session_path(session_id)
+    docstore_path = _docstore_path(session_id)
+    digest = digest or _store_digest(store)
+    payload = (
+        store.docstore,
+        store.index_to_docstore_id,
+        digest,
+        _embedding_identity(store.embedding_function),
+        store.index.d,
+    )
+    with _SAVE_LOCKS[hash(session_id) % len(_SAVE_LOCKS)]:
+        if index_path.is_dir():
+            # Stores used to be written with save_local, which creates a directory here.
+            shutil.rmtree(index_path, ignore_errors=True)
+        # Write to unique temporary files and rename them so readers holding an mmap keep
+        # the old inode and concurrent writers never move each other's files.
+        index_tmp = _temp_path(session_id, ".faiss")
+        docstore_tmp = _temp_path(session_id, ".pkl")
+        try:
+            faiss.write_index(store.index, str(index_tmp))
+            with open(docstore_tmp, "wb") as fh:
+                pickle.dump(payload, fh)
+            os.replace(index_tmp, index_path)
+            os.replace(docstore_tmp, docstore_path)
+        finally:
+            index_tmp.unlink(missing_ok=True)
+            docstore_tmp.unlink(missing_ok=True)
+    _remember(session_id, digest, store)
+
+
+def _temp_path(session_id: str, suffix: str) -> Path:
+    fd, name = tempfile.mkstemp(prefix=f"{session_id}.", suffix=suffix + ".tmp", dir=VECTOR_ROOT)
+    os.close(fd)
+    return Path(name)
+
+
+def _store_digest(store: FAISS) -> str:
+    mapping = store.index_to_docstore_id
+    return _corpus_digest([store.docstore.search(mapping[i]).page_content for i in range(len(mapping))])
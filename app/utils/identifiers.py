@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 import uuid
+from typing import List
 
 
 def new_id(prefix: str) -> str:
     return f"{prefix}_{uuid.uuid4().hex}"
+
+
+def new_ids(prefix: str, count: int) -> List[str]:
+    # One random 96-bit base plus a 32-bit counter keeps ids the same length as new_id().
+    base = uuid.uuid4().hex[:24]
+    return [f"{prefix}_{base}{index:08x}" for index in range(count)]
@@ -1,23 +1,45 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, List
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
 
 
 SENTENCE_PATTERN = re.compile(r"(?<=[。！？!?])\s+")
 
 
 def normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return " ".join(text.split())
 
 
 def split_sentences(text: str) -> List[str]:
-    return [seg.strip() for seg in SENTENCE_PATTERN.split(text) if seg.strip()]
+    if not text:
+        return []
+    return list(_iter_sentences(text))
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    # Lazy equivalent of SENTENCE_PATTERN.split so callers can stop after the first few.
+    start = 0
+    for match in SENTENCE_PATTERN.finditer(text):
+        if stripped := text[start : match.start()].strip():
+            yield stripped
+        start = match.end()
+    if stripped := text[start:].strip():
+        yield stripped
+
+
+# Note bodies are re-split whenever cards or mock papers are regenerated; keep recent results.
+@lru_cache(maxsize=512)
+def cached_sentences(text: str) -> Tuple[str, ...]:
+    return tuple(split_sentences(text))
 
 
 def take_sentences(text: str, count: int) -> str:
-    sentences = split_sentences(text)
-    return " ".join(sentences[:count])
+    if not text or count <= 0:
+        return ""
+    return " ".join(islice(_iter_sentences(text), count))
 
 
 def bullet_join(items: Iterable[str]) -> str: